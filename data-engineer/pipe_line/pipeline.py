@@ -5,11 +5,13 @@ DB = 'my_database.db'
 TABLE = 'events'
 
 
-processor = XMLProcessor(DIR, DB, TABLE)
-processor.read_directory()
-processor.load_xml_to_sqlite()
-processor.window_by_datetime('1D')
-ro_records = processor.process_to_RO()
-
-for record in ro_records:
-    print(record)
\ No newline at end of file
+# Guarded so process-pool workers started with spawn can re-import this module
+if __name__ == '__main__':
+    processor = XMLProcessor(DIR, DB, TABLE)
+    processor.read_directory()
+    processor.load_xml_to_sqlite()
+    processor.window_by_datetime('1D')
+    ro_records = processor.process_to_RO()
+
+    for record in ro_records:
+        print(record)
\ No newline at end of file
@@ -2,7 +2,14 @@ import unittest
 import os
 import pandas as pd
 import json
-from xml_processor import XMLProcessor  # Adjust the import based on your actual module name
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import pyarrow as pa
+import pyarrow.parquet as pq
+from lxml import etree
+from xml_processor import PARALLEL_MIN_FILES, XMLProcessor, _flatten_event, _iterparse_event, _target_parse_event  # Adjust the import based on your actual module name
 
 class TestXMLProcessor(unittest.TestCase):
 
@@ -72,7 +79,108 @@ class TestXMLProcessor(unittest.TestCase):
         self.assertEqual(flattened_record['order_id'], '101')
         self.assertEqual(flattened_record['status'], 'In Progress')
         self.assertEqual(flattened_record['technician'], 'Jane Smith')
-        self.assertIn('repair_parts', flattened_record)
+        self.assertEqual(flattened_record['repair_parts'], [{'name': 'Air Filter', 'quantity': '1'}])
+
+    def test_flatten_event_with_encoding_declaration(self):
+        """Test flattening an XML event string that declares its encoding."""
+        event_data = '<?xml version="1.0" encoding="UTF-8"?>\n' + self.test_xml_content[1]
+        flattened_record = self.processor.flatten_event(event_data, 'test2.xml')
+        self.assertEqual(flattened_record['order_id'], '102')
+        self.assertEqual(flattened_record['technician'], 'John Doe')
+
+    def test_iterparse_event(self):
+        """Test that the streaming parser for large files matches flatten_event."""
+        filename = 'test1.xml'
+        args = (filename, self.processor.pipeline_id, self.processor.load_datetime)
+        streamed_values = _iterparse_event(os.path.join(self.test_dir, filename), *args)
+        flattened_values = _flatten_event(etree.fromstring(self.test_xml_content[0]), *args)
+        self.assertEqual(streamed_values, flattened_values)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'ru_maxrss is reported in KiB on Linux')
+    def test_iterparse_event_releases_the_tree(self):
+        """Test that streaming a large file peaks well below parsing the whole tree."""
+        measure = """
+import resource, sys
+from lxml import etree
+from xml_processor import _flatten_event, _iterparse_event
+file_path, mode = sys.argv[1:]
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if mode == 'iterparse':
+    _iterparse_event(file_path, 'large.xml', 'p', 'l')
+else:
+    _flatten_event(etree.parse(file_path).getroot(), 'large.xml', 'p', 'l')
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+"""
+        module_dir = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'large.xml')
+            with open(file_path, 'w') as f:
+                f.write(self.test_xml_content[0].replace(
+                    '<repair_details>',
+                    '<history>' + ''.join(f'<entry id="{i}"><note>Inspected unit {i}</note></entry>'
+                                          for i in range(50000)) + '</history><repair_details>'))
+            growth = {}
+            for mode in ('iterparse', 'parse'):
+                result = subprocess.run([sys.executable, '-c', measure, file_path, mode], cwd=tmp_dir,
+                                        env={**os.environ, 'PYTHONPATH': module_dir},
+                                        capture_output=True, text=True, check=True)
+                growth[mode] = int(result.stdout)
+        self.assertLess(growth['iterparse'] * 4, growth['parse'])
+
+    def test_parsers_ignore_fields_outside_schema_paths(self):
+        """Test that every parser path reads only the schema's technician and parts."""
+        content = """<event>
+    <order_id>105</order_id>
+    <date_time>2023-08-12T09:00:00</date_time>
+    <status>Completed</status>
+    <cost>20.00</cost>
+    <history>
+        <technician>Old Tech</technician>
+        <part name="removed"/>
+    </history>
+    <repair_details>
+        <technician>T</technician>
+        <repair_parts>
+            <part name="p"/>
+        </repair_parts>
+    </repair_details>
+</event>"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'history.xml')
+            with open(file_path, 'w') as f:
+                f.write(content)
+            args = ('history.xml', self.processor.pipeline_id, self.processor.load_datetime)
+            results = [
+                _flatten_event(etree.fromstring(content), *args),
+                _iterparse_event(file_path, *args),
+                _target_parse_event(file_path, *args),
+            ]
+        for values in results:
+            self.assertEqual(values[5:7], ('T', [{'name': 'p'}]))
+
+    def test_parsers_accept_empty_but_reject_missing_fields(self):
+        """Test that an empty element reads as None while a missing one is an error."""
+        args = ('status.xml', self.processor.pipeline_id, self.processor.load_datetime)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'status.xml')
+            for status, expected in (('<status/>', None), ('', ValueError)):
+                content = self.test_xml_content[0].replace('<status>In Progress</status>', status)
+                with open(file_path, 'w') as f:
+                    f.write(content)
+                for parse in (lambda: _flatten_event(etree.fromstring(content), *args),
+                              lambda: _iterparse_event(file_path, *args),
+                              lambda: _target_parse_event(file_path, *args)):
+                    if expected is ValueError:
+                        self.assertRaises(ValueError, parse)
+                    else:
+                        self.assertIsNone(parse()[3])
+
+    def test_target_parse_event(self):
+        """Test that the parser-target fast path matches flatten_event."""
+        filename = 'test2.xml'
+        args = (filename, self.processor.pipeline_id, self.processor.load_datetime)
+        flattened_values = _flatten_event(etree.fromstring(self.test_xml_content[1]), *args)
+        self.assertEqual(_target_parse_event(os.path.join(self.test_dir, filename), *args), flattened_values)
 
     def test_process_xml_files(self):
         """Test processing of XML files."""
@@ -80,6 +188,62 @@ class TestXMLProcessor(unittest.TestCase):
         _, bad_df = self.processor.process_xml_files()        
         self.assertEqual(len(bad_df), 0)  # Assuming no bad files
 
+    def test_process_xml_files_in_process_pool(self):
+        """Test that batches large enough for the process pool are parsed in file order."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i in range(PARALLEL_MIN_FILES):
+                with open(os.path.join(tmp_dir, f'event_{i:03d}.xml'), 'w') as f:
+                    f.write(self.test_xml_content[i % 2])
+            with open(os.path.join(tmp_dir, 'broken.xml'), 'w') as f:
+                f.write('<event><order_id>1</order_id>')
+
+            processor = XMLProcessor(tmp_dir, 'test.db', 'test_table')
+            processor.read_directory()
+            good_cols, bad_records = processor.process_xml_files()
+
+        self.assertEqual(len(good_cols['order_id']), PARALLEL_MIN_FILES)
+        self.assertEqual(len(bad_records), 1)
+        self.assertEqual(bad_records[0]['filename'], 'broken.xml')
+        for file, order_id in zip(good_cols['filename'], good_cols['order_id']):
+            self.assertEqual(order_id, '101' if int(file[6:9]) % 2 == 0 else '102')
+
+    def test_load_xml_to_sqlite(self):
+        """Test loading events, errors and the audit record into a fresh SQLite database."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = os.path.join(tmp_dir, 'data')
+            os.makedirs(data_dir)
+            for file_name, content in zip(self.test_files, self.test_xml_content):
+                with open(os.path.join(data_dir, file_name), 'w') as f:
+                    f.write(content)
+            with open(os.path.join(data_dir, 'broken.xml'), 'w') as f:
+                f.write('<event><order_id>1</order_id>')
+
+            processor = XMLProcessor(data_dir, os.path.join(tmp_dir, 'test.db'), 'test_table')
+            processor.read_directory()
+            processor.load_xml_to_sqlite()
+
+            with sqlite3.connect(processor.db_name) as conn:
+                counts = {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+                          for table in ('test_table', 'test_table_error_records', 'test_table_audit')}
+                repair_parts = dict(conn.execute(
+                    'SELECT order_id, repair_parts FROM test_table WHERE typeof(repair_parts) = "text"'))
+                journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+            conn.close()
+
+            parquet_events = pq.read_table(processor.parquet_dir)
+
+        self.assertEqual(counts, {'test_table': 2, 'test_table_error_records': 1, 'test_table_audit': 1})
+        self.assertEqual(json.loads(repair_parts['101']), [{'name': 'Air Filter', 'quantity': '1'}])
+        self.assertEqual(json.loads(repair_parts['102']), [{'name': 'Oil Filter', 'quantity': '2'}])
+        self.assertEqual(journal_mode, 'wal')
+
+        parquet_parts = parquet_events.column('repair_parts')
+        self.assertTrue(pa.types.is_list(parquet_parts.type))
+        self.assertTrue(pa.types.is_struct(parquet_parts.type.value_type))
+        self.assertEqual(dict(zip(parquet_events.column('order_id').to_pylist(), parquet_parts.to_pylist())),
+                         {'101': [{'name': 'Air Filter', 'quantity': '1'}],
+                          '102': [{'name': 'Oil Filter', 'quantity': '2'}]})
+
     def test_window_by_datetime(self):
         """Test windowing by datetime."""
         self.processor.read_directory()
@@ -87,6 +251,45 @@ class TestXMLProcessor(unittest.TestCase):
         windowed_data = self.processor.window_by_datetime('1D')
         self.assertEqual(len(windowed_data), 2)  # Expecting 2 windows based on test data
 
+    def test_window_by_datetime_skips_empty_windows(self):
+        """Test that only populated windows are returned, keeping the latest event."""
+        processor = XMLProcessor(self.test_dir, 'test.db', 'test_table')
+        processor.eventDf = pd.DataFrame({
+            'order_id': ['101', '101', '102'],
+            'date_time': ['2023-08-10T18:00:00', '2023-08-10T08:00:00', '2024-01-01T09:00:00'],
+            'status': ['Reopened', 'Received', 'Completed'],
+        })
+        windowed_data = processor.window_by_datetime('1D')
+        self.assertEqual(list(windowed_data), ['2023-08-10 00:00:00', '2024-01-01 00:00:00'])
+        self.assertEqual(windowed_data['2023-08-10 00:00:00']['status'], 'Reopened')
+
+    def test_window_by_datetime_outlier_timestamp(self):
+        """Test that a small window over decades-apart timestamps builds only populated windows."""
+        processor = XMLProcessor(self.test_dir, 'test.db', 'test_table')
+        processor.eventDf = pd.DataFrame({
+            'order_id': ['100', '101', '102'],
+            'date_time': ['1970-01-01T00:00:00', '2023-08-10T10:00:30', '2023-08-10T10:00:10'],
+            'status': ['Received', 'Completed', 'In Progress'],
+        })
+        windowed_data = processor.window_by_datetime('1min')
+        self.assertEqual(list(windowed_data), ['1970-01-01 00:00:00', '2023-08-10 10:00:00'])
+        self.assertEqual(windowed_data['2023-08-10 10:00:00']['status'], 'Completed')
+
+    def test_window_by_datetime_calendar_window(self):
+        """Test windowing by calendar offsets, labelled as resample labels them."""
+        processor = XMLProcessor(self.test_dir, 'test.db', 'test_table')
+        processor.eventDf = pd.DataFrame({
+            'order_id': ['101', '102', '103'],
+            'date_time': ['2023-08-10T08:00:00', '2023-08-12T18:00:00', '2023-10-02T09:00:00'],
+            'status': ['Received', 'Completed', 'Completed'],
+        })
+        windowed_data = processor.window_by_datetime('W')
+        self.assertEqual(list(windowed_data), ['2023-08-13 00:00:00', '2023-10-08 00:00:00'])
+        self.assertEqual(windowed_data['2023-08-13 00:00:00']['order_id'], '102')
+
+        windowed_data = processor.window_by_datetime('MS')
+        self.assertEqual(list(windowed_data), ['2023-08-01 00:00:00', '2023-10-01 00:00:00'])
+
     def test_process_to_RO(self):
         """Test transforming windowed data into structured RO format."""
         self.processor.read_directory()
@@ -94,6 +297,51 @@ class TestXMLProcessor(unittest.TestCase):
         self.processor.window_by_datetime('1D')
         ro_list = self.processor.process_to_RO()
         self.assertEqual(len(ro_list), 2)  # Expecting 2 RO records
+        self.assertEqual(len(set(ro_list)), 2)  # ROs stay hashable despite the list field
+
+    def test_process_streaming(self):
+        """Test that the single-pass pipeline yields the same ROs as the DataFrame path."""
+        for window in ('1D', '6h', '1min', '7D'):
+            with self.subTest(window=window):
+                processor = XMLProcessor(self.test_dir, 'test.db', 'test_table')
+                processor.read_directory()
+                processor.process_xml_files()
+                processor.window_by_datetime(window)
+                expected = [repr(ro) for ro in processor.process_to_RO()]
+
+                streaming = XMLProcessor(self.test_dir, 'test.db', 'test_table')
+                streaming.read_directory()
+                ro_list = streaming.process_streaming(window)
+                self.assertEqual([repr(ro) for ro in ro_list], expected)
+
+    def test_process_streaming_rejects_calendar_windows(self):
+        """Test that calendar windows fail up front instead of deep in the parse loop."""
+        streaming = XMLProcessor(self.test_dir, 'test.db', 'test_table')
+        streaming.read_directory()
+        for window in ('W', 'MS'):
+            with self.assertRaisesRegex(ValueError, 'fixed-frequency'):
+                streaming.process_streaming(window)
+
+    def test_process_streaming_offset_timestamps(self):
+        """Test that offset-aware date_times stream into the same ROs as the DataFrame path."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i, content in enumerate(self.test_xml_content):
+                with open(os.path.join(tmp_dir, f'offset{i}.xml'), 'w') as f:
+                    f.write(content.replace('T10:00:00<', 'T10:00:00+02:00<')
+                                   .replace('T12:00:00<', 'T12:00:00+02:00<'))
+
+            processor = XMLProcessor(tmp_dir, 'test.db', 'test_table')
+            processor.read_directory()
+            processor.process_xml_files()
+            processor.window_by_datetime('1D')
+            expected = [repr(ro) for ro in processor.process_to_RO()]
+
+            streaming = XMLProcessor(tmp_dir, 'test.db', 'test_table')
+            streaming.read_directory()
+            ro_list = streaming.process_streaming('1D')
+
+        self.assertEqual(len(expected), 2)
+        self.assertEqual([repr(ro) for ro in ro_list], expected)
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,18 @@
 import os
 import pandas as pd
 import sqlite3
-import json
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 import uuid
 import logging
-import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+import lxml.etree as ET
+from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
 from typing import Dict, List
 
 logging.basicConfig(
@@ -17,27 +24,220 @@ logging.basicConfig(
     ]
 )
 
+# Files are parsed in a process pool only when there are enough of them to
+# amortise the worker start-up; chunksize keeps the per-task IPC overhead low.
+PARALLEL_MIN_FILES = 64
+PARALLEL_CHUNKSIZE = 32
+
+# Batches above this many files use the schema-specialised _EventTarget parser,
+# which skips building Element trees altogether.
+TARGET_PARSER_MIN_FILES = 1000
+
+# Files above this size are streamed with iterparse instead of parsed whole.
+LARGE_FILE_BYTES = 512 * 1024
+
+# Rows per executemany call when flushing an Arrow batch to SQLite.
+SQLITE_BATCH_ROWS = 500
+
+EVENT_COLUMNS = ('pipeline_id', 'order_id', 'date_time', 'status', 'cost', 'technician',
+                 'repair_parts', 'filename', 'load_datetime')
+_DATE_TIME_INDEX = EVENT_COLUMNS.index('date_time')
+
+# Element paths below the root element that hold the scalar fields and parts
+_FIELD_PATHS = {
+    ('order_id',): 'order_id',
+    ('date_time',): 'date_time',
+    ('status',): 'status',
+    ('cost',): 'cost',
+    ('repair_details', 'technician'): 'technician',
+}
+_PART_PATH = ('repair_details', 'repair_parts', 'part')
+
+# Compiled once so each event is a single call into libxml2's XPath evaluator.
+# They select the elements rather than text(), so an empty element can be told
+# apart from a missing one.
+_XP_ORDER = ET.XPath('order_id')
+_XP_DATE_TIME = ET.XPath('date_time')
+_XP_STATUS = ET.XPath('status')
+_XP_COST = ET.XPath('cost')
+_XP_TECH = ET.XPath('repair_details/technician')
+_XP_PARTS = ET.XPath('repair_details/repair_parts/part')
+
+# Marks a required element that is absent; an empty element is read as None
+_MISSING = object()
+
+
+def _first_text(elements):
+    """Returns the text of the first matched element, or _MISSING when nothing matched."""
+    return elements[0].text if elements else _MISSING
+
+
+def _event_values(order_id, date_time, status, cost, technician, parts,
+                  filename, pipeline_id, load_datetime):
+    """Combines the extracted event fields into a single row ordered as EVENT_COLUMNS."""
+    if any(value is _MISSING for value in (order_id, date_time, status, cost, technician)):
+        raise ValueError(f"Missing required field in '{filename}'")
+
+    # Log the processing with pipeline information
+    logging.info(f"Processed event from file '{filename}'. ")
+
+    return (pipeline_id, order_id, date_time, status, cost, technician,
+            parts, filename, load_datetime)
+
+def _flatten_event(root, filename, pipeline_id, load_datetime):
+    """Flattens a parsed XML event element into a single row of event values."""
+    technician = None
+    parts = []
+
+    # Extract main fields
+    order_id = _first_text(_XP_ORDER(root))
+    date_time = _first_text(_XP_DATE_TIME(root))
+    status = _first_text(_XP_STATUS(root))
+    cost = _first_text(_XP_COST(root))
+
+    # Extract technician
+    technician = _first_text(_XP_TECH(root))
+
+    # Extract repair parts
+    for part in _XP_PARTS(root):
+        parts.append(dict(part.attrib))
+
+    return _event_values(order_id, date_time, status, cost, technician, parts,
+                         filename, pipeline_id, load_datetime)
+
+def _relative_path(elem):
+    """Returns the tags from below the root element down to elem."""
+    path = []
+    parent = elem.getparent()
+    while parent is not None:
+        path.append(elem.tag)
+        elem, parent = parent, parent.getparent()
+    return tuple(reversed(path))
+
+def _iterparse_event(file_path, filename, pipeline_id, load_datetime):
+    """Flattens a large XML event file without building the whole tree in memory."""
+    fields = {}
+    parts = []
+
+    for _, elem in ET.iterparse(file_path, events=('end',)):
+        path = _relative_path(elem)
+        if path == _PART_PATH:
+            parts.append(dict(elem.attrib))
+        elif path in _FIELD_PATHS:
+            # Keep the first occurrence, as the XPath lookups would
+            fields.setdefault(_FIELD_PATHS[path], elem.text)
+        # Free every finished subtree, schema or not, and detach the siblings
+        # already read so the parents do not keep the cleared elements alive
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    return _event_values(fields.get('order_id', _MISSING), fields.get('date_time', _MISSING),
+                         fields.get('status', _MISSING), fields.get('cost', _MISSING),
+                         fields.get('technician', _MISSING), parts,
+                         filename, pipeline_id, load_datetime)
+
+class _EventTarget:
+    """
+    lxml parser target specialised for the event schema. It records the
+    scalar fields and repair parts straight from the parser callbacks, so no
+    Element objects are created.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.parts = []
+        self._path = []
+        self._text = []
+
+    def start(self, tag, attrib):
+        self._path.append(tag)
+        self._text = []
+        if tuple(self._path[1:]) == _PART_PATH:
+            self.parts.append(dict(attrib))
+
+    def data(self, data):
+        self._text.append(data)
+
+    def end(self, tag):
+        field = _FIELD_PATHS.get(tuple(self._path[1:]))
+        if field is not None and field not in self.fields:
+            # Keep the first occurrence, as the XPath lookups would
+            self.fields[field] = ''.join(self._text) or None
+        self._path.pop()
+        self._text = []
+
+    def close(self):
+        return self.fields, self.parts
+
+def _target_parse_event(file_path, filename, pipeline_id, load_datetime):
+    """Flattens an XML event file with the _EventTarget parser."""
+    parser = ET.XMLParser(target=_EventTarget())
+    fields, parts = ET.parse(file_path, parser)
+
+    return _event_values(fields.get('order_id', _MISSING), fields.get('date_time', _MISSING),
+                         fields.get('status', _MISSING), fields.get('cost', _MISSING),
+                         fields.get('technician', _MISSING), parts,
+                         filename, pipeline_id, load_datetime)
+
+def _error_record(file, content, pipeline_id, load_datetime):
+    return {
+        'pipeline_id': pipeline_id,
+        'filename': file,
+        'xml_data': content,  # raw XML text
+        'load_datetime': load_datetime  
+    }
+
+def _parse_one(args):
+    """
+    Reads and flattens a single XML file. Module level so it can be pickled
+    into a worker process.
+
+    The last element of args selects the schema-specialised _EventTarget parser.
+
+    Returns:
+        Tuple[bool, Union[tuple, dict]]: (True, event values) on success,
+        otherwise (False, error record).
+    """
+    file_path, file, pipeline_id, load_datetime, use_target = args
+    try:
+        if use_target:
+            return True, _target_parse_event(file_path, file, pipeline_id, load_datetime)
+        if os.path.getsize(file_path) > LARGE_FILE_BYTES:
+            return True, _iterparse_event(file_path, file, pipeline_id, load_datetime)
+        # libxml2 reads the file itself, with no intermediate Python string
+        root = ET.parse(file_path).getroot()
+        return True, _flatten_event(root, file, pipeline_id, load_datetime)
+    except Exception:
+        logging.error(f"Error processing {file} with pipeline ID: {pipeline_id}")
+        event_data = Path(file_path).read_bytes()
+        return False, _error_record(file, event_data.decode(errors='replace'), pipeline_id, load_datetime)
+
 class XMLProcessor:
     def __init__(self, directory, db_name, table_name):
         self.directory = directory
         self.db_name = db_name
         self.table_name = table_name
+        # One Parquet file per pipeline run is written into this dataset directory
+        self.parquet_dir = os.path.join(os.path.dirname(os.path.abspath(db_name)), f'{table_name}_parquet')
         self.files = []
+        self.file_paths = []
         self.pipeline_id = str(uuid.uuid4())  # Generate a unique pipeline ID once
         self.load_datetime = datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # Get current datetime once
-        self.combined_records = []
+        # Events are staged column-wise, one list per field, rather than as a dict per row
+        self.combined_cols = {col: [] for col in EVENT_COLUMNS}
         self.combined_err_records = []
         self.eventDf = None
         self.windowed_data = {}
 
+    # eq=False keeps the identity equality and hashing of a plain class
+    @dataclass(slots=True, eq=False)
     class RO:
-        def __init__(self, order_id: int, status: str,
-                    cost: float, technician: str, repair_parts: List[dict]):
-            self.order_id = order_id
-            self.status = status
-            self.cost = cost
-            self.technician = technician
-            self.repair_parts = repair_parts
+        order_id: int
+        status: str
+        cost: float
+        technician: str
+        repair_parts: List[dict]
 
         def __repr__(self):
             return (f"RO(order_id={self.order_id}, "
@@ -48,31 +248,69 @@ class XMLProcessor:
         Transforms windowed data into a structured RO format.
 
         Parameters:
-            windowed_data (Dict[str, pd.Series]): The windowed data with timestamps as keys.
+            windowed_data (Dict[str, dict]): The latest event record per window.
 
         Returns:
             List[RO]: A list of RO objects representing the structured data.
         """
-        ro_list = []
-
-        for window, row in self.windowed_data.items():
-            # Extract the required fields from the DataFrame row
-            ro = self.RO(
-                order_id=row['order_id'],
-                status=row['status'],
-                cost=row['cost'],
-                technician=row['technician'],
-                repair_parts=json.loads(row['repair_parts'])
-            )
-            ro_list.append(ro)
+        # Plain record dicts, so no Series or Index objects are built per window
+        ro_list = [
+            self.RO(row['order_id'], row['status'], row['cost'], row['technician'], row['repair_parts'])
+            for row in self.windowed_data.values()
+        ]
 
         logging.info("Processed data into structured RO format.")
         return ro_list
 
+    def process_streaming(self, window) -> List[RO]:
+        """
+        Parses the XML files, windows them by date_time and builds ROs in a
+        single pass. Only the latest event of each window is kept in memory, so
+        no event DataFrame is built; use load_xml_to_sqlite for the database sink.
+
+        Parameters:
+            window (Union[str, timedelta]): A fixed-frequency time window
+                (e.g., '1D' or timedelta(days=1)).
+
+        Returns:
+            List[RO]: One RO per populated window, in window order.
+
+        Raises:
+            ValueError: If window is a calendar offset such as 'W' or 'MS', which
+                window_by_datetime supports but a single floor per event cannot.
+        """
+        if not isinstance(to_offset(window), Tick):
+            raise ValueError(f"process_streaming needs a fixed-frequency window, got '{window}'; "
+                             "use window_by_datetime for calendar windows")
+        latest = {}
+
+        for ok, values in self._parse_files():
+            if not ok:
+                self.combined_err_records.append(values)
+                continue
+            # Timestamp handles offset-aware date_times the same way pd.to_datetime does
+            event_time = pd.Timestamp(values[_DATE_TIME_INDEX])
+            window_start = event_time.floor(window)
+            current = latest.get(window_start)
+            if current is None or event_time >= current[0]:
+                latest[window_start] = (event_time, values)
+
+        ro_list = []
+        for _, (_, values) in sorted(latest.items()):
+            _, order_id, _, status, cost, technician, repair_parts, _, _ = values
+            ro_list.append(self.RO(order_id, status, cost, technician, repair_parts))
+
+        logging.info(f"Streamed events into window '{window}' and processed them into RO format.")
+        return ro_list
+
     def read_directory(self):
         """Reads the directory and lists the XML files."""
         try:
-            self.files = [f for f in os.listdir(self.directory) if f.endswith('.xml')]
+            with os.scandir(self.directory) as entries:
+                xml_entries = [e for e in entries if e.name.endswith('.xml') and e.is_file()]
+            self.files = [e.name for e in xml_entries]
+            # Full paths come with the directory entries, so the parse loop needs no join
+            self.file_paths = [e.path for e in xml_entries]
             return self.files
         except FileNotFoundError:
             logging.error(f"Directory {self.directory} not found.")
@@ -80,98 +318,118 @@ class XMLProcessor:
 
     def flatten_event(self, event, filename):
         """Flattens the XML event structure into a single record, including filename, unique pipeline ID, and load datetime."""
-        technician = None
-        parts = []
-
-        # Parse the XML string into an ElementTree
+        if isinstance(event, str):
+            # lxml rejects str input that carries an encoding declaration
+            event = event.encode()
         root = ET.fromstring(event)
+        return dict(zip(EVENT_COLUMNS, _flatten_event(root, filename, self.pipeline_id, self.load_datetime)))
 
-        # Extract main fields
-        order_id = root.find('order_id').text
-        date_time = root.find('date_time').text
-        status = root.find('status').text
-        cost = root.find('cost').text
-
-        # Extract technician
-        technician = root.find('repair_details/technician').text
-
-        # Extract repair parts
-        repair_parts = root.find('repair_details/repair_parts')
-        if repair_parts is not None:
-            for part in repair_parts.findall('part'):
-                parts.append({
-                    'name': part.get('name'),
-                    'quantity': part.get('quantity')
-                })
-
-        # Create a single record combining all necessary fields
-        record = {
-            'pipeline_id': self.pipeline_id,
-            'order_id': order_id,
-            'date_time': date_time,
-            'status': status,
-            'cost': cost,
-            'technician': technician,
-            'repair_parts': json.dumps(parts),  
-            'filename': filename,
-            'load_datetime': self.load_datetime  
-        }
-
-        # Log the processing with pipeline information
-        logging.info(f"Processed event from file '{filename}'. ")
-
-        return record
     def error_record(self, file, content):
-        return {
-            'pipeline_id': self.pipeline_id,
-            'filename': file,
-            'xml_data': json.dumps(content),              
-            'load_datetime': self.load_datetime  
-        }
+        return _error_record(file, content, self.pipeline_id, self.load_datetime)
     
+    def _parse_files(self):
+        """Yields the (ok, values) result of _parse_one for each file, in file order."""
+        use_target = len(self.files) > TARGET_PARSER_MIN_FILES
+        tasks = [(file_path, file, self.pipeline_id, self.load_datetime, use_target)
+                 for file_path, file in zip(self.file_paths, self.files)]
+        if len(tasks) < PARALLEL_MIN_FILES:
+            yield from map(_parse_one, tasks)
+        else:
+            with ProcessPoolExecutor() as executor:
+                yield from executor.map(_parse_one, tasks, chunksize=PARALLEL_CHUNKSIZE)
+
     def process_xml_files(self):
-        """Processes each XML file and returns a combined DataFrame."""
-        
-        for file in self.files:
-            file_path = os.path.join(self.directory, file)
-            with open(file_path, 'r') as f:
-                    event_data = f.read()
-            try:
-                # Flatten each event and append to combined_records
-                flattened_record = self.flatten_event(event_data, file)  
-                self.combined_records.append(flattened_record)              
-            except Exception as e:
+        """Processes each XML file and returns the combined event columns and error records."""
+        event_cols = [self.combined_cols[col] for col in EVENT_COLUMNS]
+        for ok, record in self._parse_files():
+            if ok:
+                for column, value in zip(event_cols, record):
+                    column.append(value)
+            else:
+                self.combined_err_records.append(record)
+
+        # The event DataFrame is only built once windowing needs it
+        self.eventDf = None
+
+        return self.combined_cols, self.combined_err_records
+
+    @staticmethod
+    def _sqlite_type(arrow_type) -> str:
+        """Maps an Arrow type onto the SQLite column affinity used by to_sql."""
+        if pa.types.is_integer(arrow_type):
+            return 'INTEGER'
+        if pa.types.is_floating(arrow_type):
+            return 'REAL'
+        return 'TEXT'
 
-                logging.error(f"Error processing {file} with pipeline ID: {self.pipeline_id}")
-                self.combined_err_records.append(self.error_record(file, event_data))
+    @staticmethod
+    def _restore_durable_pragmas(conn):
+        """Switches the connection back to the durable settings for regular use."""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
 
-                
-            
-        # Convert combined_records to DataFrame
-        self.eventDf = pd.DataFrame(self.combined_records)
-        error_df = pd.DataFrame(self.combined_err_records)
+    def _fast_append(self, batch, table_name):
+        """
+        Appends an Arrow RecordBatch to a SQLite table, executemany-ing it in slices
+        under bulk-load PRAGMAs.
+        """
+        columns = ', '.join(f'"{name}"' for name in batch.schema.names)
+        column_defs = ', '.join(f'"{field.name}" {self._sqlite_type(field.type)}'
+                                for field in batch.schema)
+        placeholders = ', '.join('?' * batch.num_columns)
+        insert_sql = f'INSERT INTO "{table_name}" ({columns}) VALUES ({placeholders})'
 
-        return self.eventDf,error_df
+        with sqlite3.connect(self.db_name) as conn:
+            # Bulk-load settings: in-memory rollback journal, no fsyncs, large page cache
+            conn.execute("PRAGMA journal_mode=MEMORY")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-200000")
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(f'CREATE TABLE IF NOT EXISTS "{table_name}" ({column_defs})')
+                for offset in range(0, batch.num_rows, SQLITE_BATCH_ROWS):
+                    chunk = batch.slice(offset, SQLITE_BATCH_ROWS)
+                    conn.executemany(insert_sql, zip(*(column.to_pylist() for column in chunk.columns)))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.rollback()
+                # Don't let a failed restore hide the error that aborted the load
+                try:
+                    self._restore_durable_pragmas(conn)
+                except sqlite3.Error as e:
+                    logging.error(f"Error restoring SQLite journal settings: {e}")
+                raise
+            self._restore_durable_pragmas(conn)
 
-    def save_to_sqlite(self, df, table_name, type_of_records):
-        """Saves the DataFrame to a SQLite database."""
+    def save_to_sqlite(self, batch, table_name, type_of_records):
+        """Saves an Arrow RecordBatch to a SQLite database."""
         try:
-            with sqlite3.connect(self.db_name) as conn:
-                df.to_sql(table_name, conn, if_exists='append', index=False)
-                logging.info(f"{type_of_records} Data saved to table '{table_name}' in database '{self.db_name}' with pipeline ID: {self.pipeline_id}.")
+            self._fast_append(batch, table_name)
+            logging.info(f"{type_of_records} Data saved to table '{table_name}' in database '{self.db_name}' with pipeline ID: {self.pipeline_id}.")
         except Exception as e:
             logging.error(f"Error saving to SQLite: {e}")
 
+    def save_to_parquet(self, batch, table_name):
+        """Saves an Arrow RecordBatch, with repair_parts as a nested list<struct> column, to Parquet."""
+        try:
+            os.makedirs(self.parquet_dir, exist_ok=True)
+            file_path = os.path.join(self.parquet_dir, f'{self.pipeline_id}.parquet')
+            pq.write_table(pa.Table.from_batches([batch]), file_path)
+            logging.info(f"Data for table '{table_name}' saved to '{file_path}' with pipeline ID: {self.pipeline_id}.")
+        except Exception as e:
+            logging.error(f"Error saving to Parquet: {e}")
+
     def get_audit_record(self):
         return[ {
             'pipeline_id': self.pipeline_id,
             'no_files_in_dir': len(self.files),
-            'no_records_loaded_successfully': len(self.combined_records),
+            'no_records_loaded_successfully': len(self.combined_cols['pipeline_id']),
              'no_records_failed_to_load': len(self.combined_err_records),              
             'load_datetime': self.load_datetime  
         }]
 
-    def window_by_datetime(self, window: str) -> Dict[str, pd.DataFrame]:
+    def window_by_datetime(self, window: str) -> Dict[str, dict]:
         """
         Groups the data by a specified time window based on the date_time column
         and retrieves the latest event for each window.
@@ -181,40 +439,59 @@ class XMLProcessor:
             window (str): The time window for grouping (e.g., '1D' for 1 day).
 
         Returns:
-            Dict[str, pd.DataFrame]: A dictionary where keys are window identifiers and 
-            values are DataFrames for each window.
+            Dict[str, dict]: A dictionary where keys are window identifiers and 
+            values are the latest event record for each window.
         """
-        if self.eventDf.empty:
-            logging.warning("DataFrame is empty. No windows can be created.")
-            return {}
-        self.windowed_data = self.eventDf.copy(deep=True)
-        # Ensure the date_time column is in datetime format
-        self.windowed_data['date_time'] = pd.to_datetime(self.windowed_data['date_time'])
-        
-        # Set date_time as the index
-        self.windowed_data.set_index('date_time', inplace=True)
-        
-        # Resample the data by the specified window and get the latest event
-        resampled = self.windowed_data.resample(window).last()
-
-        # Create a dictionary to hold the results
-        self.windowed_data = {}
-        
-        # Iterate over the resampled data
-        for timestamp, row in resampled.iterrows():
-            self.windowed_data[timestamp.strftime('%Y-%m-%d %H:%M:%S')] = row
-        logging.info(f"Grouped data by window '{window}' and retrieved latest events.")
-        return self.windowed_data
+        # Copy-on-Write lets assign/sort_values/iloc share the event frame's
+        # data instead of copying it up front; scoped so callers are unaffected
+        with pd.option_context('mode.copy_on_write', True):
+            if self.eventDf is None:
+                self.eventDf = pd.DataFrame(self.combined_cols, copy=False)
+            if self.eventDf.empty:
+                logging.warning("DataFrame is empty. No windows can be created.")
+                self.windowed_data = {}
+                return {}
+            # Parse date_time and order events chronologically without deep-copying the event frame
+            df = (self.eventDf
+                  .assign(date_time=pd.to_datetime(self.eventDf['date_time']))
+                  .sort_values('date_time', kind='stable'))
+
+            # Keep the latest event of each populated window
+            offset = to_offset(window)
+            if isinstance(offset, Tick):
+                # Fixed windows are floored per event, so only populated windows
+                # are ever built, however far apart the outlier timestamps are
+                window_start = df['date_time'].dt.floor(offset)
+                resampled = df.groupby(window_start, sort=False).tail(1)
+                resampled.index = pd.DatetimeIndex(window_start.loc[resampled.index], name='window_start')
+            else:
+                # Calendar offsets (W, MS, ...) keep resample's bins and labels;
+                # they have far fewer bins per year than the fixed windows
+                windows = sorted(df.groupby(pd.Grouper(key='date_time', freq=offset)).indices.items())
+                resampled = df.iloc[[positions[-1] for _, positions in windows]]
+                resampled.index = pd.DatetimeIndex([label for label, _ in windows], name='window_start')
+
+            # Map each window start to its latest event record
+            self.windowed_data = dict(zip(resampled.index.strftime('%Y-%m-%d %H:%M:%S'),
+                                          resampled.to_dict('records')))
+            logging.info(f"Grouped data by window '{window}' and retrieved latest events.")
+            return self.windowed_data
 
     def load_xml_to_sqlite(self):
         """Loads each processed XML file into the SQLite database."""
-        good_df, bad_df = self.process_xml_files()
+        good_cols, bad_records = self.process_xml_files()
         table_name = self.table_name
-        if not good_df.empty:
-            self.save_to_sqlite(good_df, table_name, 'Good')
-        if not bad_df.empty:
-            self.save_to_sqlite(bad_df, table_name+'_error_records', 'Bad')
+        if good_cols['pipeline_id']:
+            events = pa.RecordBatch.from_pydict(good_cols)
+            self.save_to_parquet(events, table_name)
+            # SQLite has no nested types, so the events table keeps repair_parts as JSON text
+            repair_parts_json = pa.array([orjson.dumps(parts).decode() for parts in good_cols['repair_parts']],
+                                         type=pa.string())
+            sqlite_events = events.set_column(events.schema.get_field_index('repair_parts'),
+                                              'repair_parts', repair_parts_json)
+            self.save_to_sqlite(sqlite_events, table_name, 'Good')
+        if bad_records:
+            self.save_to_sqlite(pa.RecordBatch.from_pylist(bad_records), table_name+'_error_records', 'Bad')
 
-        audit_df = pd.DataFrame(self.get_audit_record())
-        self.save_to_sqlite(audit_df, table_name+'_audit', 'Audit')
+        self.save_to_sqlite(pa.RecordBatch.from_pylist(self.get_audit_record()), table_name+'_audit', 'Audit')
 